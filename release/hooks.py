@@ -102,23 +102,10 @@ app_license = "MIT"
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"release.tasks.all"
-# 	],
-# 	"daily": [
-# 		"release.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"release.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"release.tasks.weekly"
-# 	]
-# 	"monthly": [
-# 		"release.tasks.monthly"
-# 	]
-# }
+scheduler_events = {
+	"all": ["release.release.search.update_queued_index"],
+	"daily": ["release.release.analytics.update_release_analytics"],
+}
 
 # Testing
 # -------
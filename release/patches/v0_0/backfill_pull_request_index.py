@@ -0,0 +1,35 @@
+import frappe
+
+
+def execute():
+	frappe.reload_doc("release", "doctype", "pull_request")
+
+	# links look like https://github.com/<org>/<repo>/pull/<number>, optionally followed by
+	# a sub page (/files), query string or anchor, matching parse_pull_request_link
+	frappe.db.sql(
+		"""
+		update `tabPull Request`
+		set
+			repository = ifnull(nullif(repository, ''), substring_index(
+				substring_index(pull_request_link, '/pull/', 1), 'github.com/', -1
+			)),
+			pull_request_number = ifnull(nullif(pull_request_number, ''), substring_index(
+				substring_index(
+					substring_index(substring_index(pull_request_link, '/pull/', -1), '/', 1),
+					'?',
+					1
+				),
+				'#',
+				1
+			))
+		where
+			pull_request_link regexp 'github\\\\.com/[^/]+/[^/]+/pull/[0-9]+([/?#]|$)'
+			and (ifnull(repository, '') = '' or ifnull(pull_request_number, '') = '')
+		"""
+	)
+
+	frappe.enqueue(
+		"release.release.doctype.pull_request.pull_request.backfill_merge_commit_shas",
+		queue="long",
+		timeout=7200,
+	)
@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+	frappe.reload_doc("release", "doctype", "pull_request")
+	frappe.enqueue("release.release.search.build_index", queue="long", timeout=3600)
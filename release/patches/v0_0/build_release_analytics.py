@@ -0,0 +1,7 @@
+import frappe
+
+
+def execute():
+	frappe.reload_doc("release", "doctype", "release_status_transition")
+	frappe.reload_doc("release", "doctype", "release_analytics")
+	frappe.enqueue("release.release.analytics.rebuild_release_analytics", queue="long")
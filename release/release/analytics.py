@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Per repository, per month Release aggregates kept in Release Analytics
+
+Every Release and its Pull Requests are counted against the month the Release was
+created in. A Release counts as released once it's submitted, since submitting it
+creates the GitHub release. Time spent in each status is derived from Release Status
+Transitions, up to the submission of the Release, or up to now while it's still open.
+"""
+
+import frappe
+from frappe.utils import add_months, get_datetime, get_first_day, now_datetime
+from giturlparse import parse
+
+status_fields = {
+	"Draft": "hours_in_draft",
+	"Processing PRs": "hours_processing_prs",
+	"Pre Release Testing": "hours_pre_release_testing",
+	"Ready": "hours_ready",
+}
+
+
+def log_status_transition(release, status):
+	frappe.get_doc(
+		{
+			"doctype": "Release Status Transition",
+			"release": release,
+			"status": status,
+			"transition_on": now_datetime(),
+		}
+	).db_insert()
+
+
+def update_release_analytics():
+	"""Recomputes the months that can still change: the last two, any month with a Release
+	that hasn't been submitted yet, and the months of Releases that were modified, or had
+	their Pull Requests modified, since the last run
+	"""
+	now = now_datetime()
+	last_run = frappe.db.get_global("release_analytics_last_run")
+
+	if last_run:
+		aggregate_release_analytics(get_months_to_update(last_run, now))
+	else:
+		aggregate_release_analytics()
+
+	frappe.db.set_global("release_analytics_last_run", str(now))
+
+
+def get_months_to_update(last_run, now):
+	months = {get_first_day(now), get_first_day(add_months(now, -1))}
+	changed_releases = frappe.get_all(
+		"Pull Request",
+		filters={"modified": (">=", last_run), "release": ("is", "set")},
+		pluck="release",
+	)
+	release_filters = {"docstatus": 0, "modified": (">=", last_run)}
+	if changed_releases:
+		release_filters["name"] = ("in", list(set(changed_releases)))
+
+	for creation in frappe.get_all("Release", or_filters=release_filters, pluck="creation"):
+		months.add(get_first_day(creation))
+
+	return months
+
+
+def rebuild_release_analytics():
+	aggregate_release_analytics()
+
+
+def aggregate_release_analytics(months=None):
+	"""Recomputes the Release Analytics of `months`, given as first days of the month, or
+	of every month if none are given
+	"""
+	release_filters = {"docstatus": ("!=", 2)}
+	if months:
+		months = {get_first_day(month) for month in months}
+		release_filters["creation"] = (">=", min(months))
+
+	releases = frappe.get_all(
+		"Release", filters=release_filters, fields=["name", "git_url", "docstatus", "creation"]
+	)
+	summaries = {}
+	release_summaries = {}
+	submitted_releases = set()
+
+	for release in releases:
+		month = get_first_day(release.creation)
+		if months and month not in months:
+			continue
+
+		parsed = parse(release.git_url)
+		key = (f"{parsed.owner}/{parsed.name}", month)
+
+		if key not in summaries:
+			summaries[key] = frappe._dict(
+				{
+					"releases": 0,
+					"released": 0,
+					"pull_requests": 0,
+					"failed_pull_requests": 0,
+					**{field: 0.0 for field in status_fields.values()},
+				}
+			)
+
+		summary = summaries[key]
+		summary.releases += 1
+		release_summaries[release.name] = summary
+
+		if release.docstatus == 1:
+			summary.released += 1
+			submitted_releases.add(release.name)
+
+	if release_summaries:
+		add_pull_request_counts(release_summaries)
+		add_status_durations(release_summaries, submitted_releases)
+
+	if months:
+		frappe.db.sql(
+			"delete from `tabRelease Analytics` where month in %(months)s",
+			{"months": tuple(months)},
+		)
+	else:
+		frappe.db.sql("delete from `tabRelease Analytics`")
+
+	for (repository, month), summary in summaries.items():
+		frappe.get_doc(
+			{
+				"doctype": "Release Analytics",
+				"repository": repository,
+				"month": month,
+				**{
+					field: frappe.utils.flt(value, 2) if field in status_fields.values() else value
+					for field, value in summary.items()
+				},
+			}
+		).db_insert()
+
+
+def add_pull_request_counts(release_summaries):
+	for row in frappe.get_all(
+		"Pull Request",
+		filters={"release": ("in", list(release_summaries)), "docstatus": ("!=", 2)},
+		fields=["release", "status", "count(name) as count"],
+		group_by="release, status",
+	):
+		summary = release_summaries[row.release]
+		summary.pull_requests += row.count
+		if row.status == "Failed":
+			summary.failed_pull_requests += row.count
+
+
+def add_status_durations(release_summaries, submitted_releases):
+	"""Adds the hours between consecutive transitions of each Release to the status it was
+	in. The last transition of a submitted Release is the one logged on submission, so it
+	closes the Release instead of accruing time until now.
+	"""
+	transitions = frappe.get_all(
+		"Release Status Transition",
+		filters={"release": ("in", list(release_summaries))},
+		fields=["release", "status", "transition_on"],
+		order_by="release asc, transition_on asc",
+	)
+	now = now_datetime()
+
+	for i, transition in enumerate(transitions):
+		field = status_fields.get(transition.status)
+		if not field:
+			continue
+
+		following = transitions[i + 1] if i + 1 < len(transitions) else None
+		if following and following.release == transition.release:
+			ended_on = get_datetime(following.transition_on)
+		elif transition.release in submitted_releases:
+			continue
+		else:
+			ended_on = now
+
+		duration = ended_on - get_datetime(transition.transition_on)
+		release_summaries[transition.release][field] += duration.total_seconds() / 3600
+
+
+@frappe.whitelist()
+def get_monthly_summary(release):
+	"""Returns the Release Analytics of the repository and month `release` belongs to"""
+	values = frappe.db.get_value("Release", release, ["git_url", "creation"])
+	if not values:
+		return
+
+	frappe.has_permission("Release", "read", release, throw=True)
+	if not frappe.has_permission("Release Analytics", "read"):
+		return
+
+	git_url, creation = values
+	parsed = parse(git_url)
+
+	return frappe.db.get_value(
+		"Release Analytics",
+		{"repository": f"{parsed.owner}/{parsed.name}", "month": get_first_day(creation)},
+		["releases", "released", "pull_requests", "failed_pull_requests"],
+		as_dict=True,
+	)
@@ -17,3 +17,17 @@ def get_branches(git_url):
 		return [x["name"] for x in res.json()]
 	else:
 		res.raise_for_status()
+
+
+@frappe.whitelist()
+def search_pull_requests(text, page=1, page_length=20, repository=None):
+	from release.release.search import search
+
+	frappe.has_permission("Pull Request", "read", throw=True)
+
+	return search(
+		text,
+		page=frappe.utils.cint(page) or 1,
+		page_length=min(frappe.utils.cint(page_length) or 20, 100),
+		repository=repository,
+	)
@@ -2,13 +2,21 @@
 # Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
 # For license information, please see license.txt
 
+import re
+
 import frappe
 from frappe.model.document import Document
-from giturlparse import parse
+
+from release.release.analytics import log_status_transition
+from release.release.search import queue_for_indexing
+
+pull_request_link_pattern = re.compile(r"github\.com/([^/]+)/([^/]+)/pull/(\d+)")
 
 
 class PullRequest(Document):
 	def before_insert(self):
+		self.set_index_fields()
+
 		existing_pull_request = frappe.db.exists(
 			self.doctype, {"pull_request_link": self.pull_request_link, "docstatus": ("!=", 2)}
 		)
@@ -23,21 +31,40 @@ class PullRequest(Document):
 		):
 			self.update_missing_description()
 
+	def on_update(self):
+		if not self.flags.in_import:
+			queue_for_indexing(self.name)
+
+	def on_cancel(self):
+		queue_for_indexing(self.name)
+
+	def on_trash(self):
+		queue_for_indexing(self.name)
+
 	def before_submit(self):
 		if self.status != "Passed":
 			frappe.throw("Can't submit Pull Request which hasn't passed manual testing")
 
 	def on_submit(self):
-		if not frappe.db.exists("Pull Request", {"release": self.release, "docstatus": 0}):
-			frappe.db.set_value("Release", self.release, "status", "Ready")
+		if not self.flags.in_bulk_review:
+			update_release_status(self.release)
 
-	def _setup_pull_request_info(self):
-		pr_url = parse(self.pull_request_link)
-		repo_url = parse(pr_url.href.rstrip(pr_url.pathname))
+	def set_index_fields(self):
+		if not self.pull_request_link:
+			return
 
-		self._pr_number = pr_url.name
-		self._repo = repo_url.name
-		self._org = repo_url.owner
+		self._setup_pull_request_info()
+
+		if not self.repository and self._org and self._repo:
+			self.repository = f"{self._org}/{self._repo}"
+
+		if not self.pull_request_number:
+			self.pull_request_number = self._pr_number
+
+	def _setup_pull_request_info(self):
+		self._org, self._repo, self._pr_number = parse_pull_request_link(
+			self.pull_request_link
+		)
 
 	def update_missing_description(self):
 		self._setup_pull_request_info()
@@ -55,3 +82,217 @@ class PullRequest(Document):
 
 		if res.ok:
 			return res.json().get("body")
+
+
+def parse_pull_request_link(link):
+	"""Splits a GitHub PR link into its organization, repository and PR number
+
+	Returns:
+		tuple: (org, repo, pr_number), with None for each part that couldn't be parsed
+	"""
+	match = pull_request_link_pattern.search(link or "")
+	if not match:
+		return None, None, None
+
+	return match.groups()
+
+
+def get_shipped_pull_requests(
+	repository, pull_numbers=(), merge_commit_shas=(), exclude_release=None
+):
+	"""Looks up Pull Requests of `repository` that have already shipped with a submitted
+	Release. Pull Requests of Releases still in draft or cancelled aren't considered shipped.
+	"""
+	return get_indexed_pull_requests(
+		repository,
+		pull_numbers=pull_numbers,
+		merge_commit_shas=merge_commit_shas,
+		exclude_release=exclude_release,
+		shipped_only=True,
+	)
+
+
+def get_indexed_pull_requests(
+	repository,
+	pull_numbers=(),
+	merge_commit_shas=(),
+	exclude_release=None,
+	shipped_only=False,
+):
+	"""Looks up Pull Requests of `repository` by PR number or merge commit SHA
+
+	Runs a single query against the indexed `repository`, `pull_request_number` and
+	`merge_commit_sha` columns so callers can check PRs in O(1) without hitting GitHub.
+
+	Returns:
+		frappe._dict: `by_number` and `by_sha` maps to dicts of the Pull Request name and release
+	"""
+	found = frappe._dict(by_number={}, by_sha={})
+	pull_numbers = tuple(str(x) for x in pull_numbers if x)
+	merge_commit_shas = tuple(x for x in merge_commit_shas if x)
+
+	if not (repository and (pull_numbers or merge_commit_shas)):
+		return found
+
+	join = ""
+	conditions = ["pr.repository = %(repository)s", "pr.docstatus != 2"]
+	if shipped_only:
+		join = "inner join `tabRelease` rel on rel.name = pr.release and rel.docstatus = 1"
+	if exclude_release:
+		conditions.append("ifnull(pr.release, '') != %(exclude_release)s")
+
+	matches = []
+	if pull_numbers:
+		matches.append("pr.pull_request_number in %(pull_numbers)s")
+	if merge_commit_shas:
+		matches.append("pr.merge_commit_sha in %(merge_commit_shas)s")
+	conditions.append(f"({' or '.join(matches)})")
+
+	for pr in frappe.db.sql(
+		f"""
+		select pr.name, pr.release, pr.pull_request_number, pr.merge_commit_sha
+		from `tabPull Request` pr {join}
+		where {' and '.join(conditions)}
+		order by pr.creation asc
+		""",
+		{
+			"repository": repository,
+			"exclude_release": exclude_release,
+			"pull_numbers": pull_numbers,
+			"merge_commit_shas": merge_commit_shas,
+		},
+		as_dict=True,
+	):
+		entry = {"name": pr.name, "release": pr.release}
+		if pr.pull_request_number:
+			found.by_number.setdefault(pr.pull_request_number, entry)
+		if pr.merge_commit_sha:
+			found.by_sha.setdefault(pr.merge_commit_sha, entry)
+
+	return found
+
+
+def update_release_status(release):
+	"""Marks a draft Release as Ready once none of its Pull Requests are left to review"""
+	if not release:
+		return
+
+	values = frappe.db.get_value("Release", release, ["status", "docstatus"], as_dict=True)
+	if not values or values.docstatus != 0 or values.status == "Ready":
+		return
+
+	if not frappe.db.exists("Pull Request", {"release": release, "docstatus": 0}):
+		frappe.db.set_value("Release", release, "status", "Ready")
+		log_status_transition(release, "Ready")
+
+
+@frappe.whitelist()
+def bulk_review(names, status, reason_for_failure=None, batch_size=100):
+	"""Sets the testing status of many Pull Requests, submitting the ones that Passed
+
+	Each batch runs in its own transaction, with a savepoint per Pull Request so one
+	invalid document doesn't roll back the rest. Release statuses are recomputed once
+	per batch for the Releases it touched.
+
+	Returns:
+		dict: names of `updated` Pull Requests and the error of each `failed` one
+	"""
+	names = frappe.parse_json(names)
+	batch_size = frappe.utils.cint(batch_size) or 100
+
+	if status not in ("Passed", "Failed"):
+		frappe.throw("Pull Requests can only be marked as Passed or Failed")
+
+	if status == "Failed" and not reason_for_failure:
+		frappe.throw("Reason for Failure is required to mark Pull Requests as Failed")
+
+	updated, failed = [], []
+
+	for i in range(0, len(names), batch_size):
+		releases = set()
+
+		for name in names[i : i + batch_size]:
+			frappe.db.savepoint("bulk_review")
+			try:
+				pr = frappe.get_doc("Pull Request", name)
+				if pr.docstatus != 0:
+					frappe.throw(f"Pull Request {name} is already {pr.status}")
+
+				pr.status = status
+				if status == "Failed":
+					pr.reason_for_failure = reason_for_failure
+
+				pr.flags.in_bulk_review = True
+				if status == "Passed":
+					pr.submit()
+				else:
+					pr.save()
+			except Exception as e:
+				frappe.db.rollback(save_point="bulk_review")
+				frappe.clear_messages()
+				failed.append({"name": name, "error": str(e)})
+			else:
+				updated.append(name)
+				releases.add(pr.release)
+
+		for release in releases:
+			update_release_status(release)
+
+		frappe.db.commit()
+
+	return {"updated": updated, "failed": failed}
+
+
+def backfill_merge_commit_shas(batch_size=100):
+	"""Fills `merge_commit_sha` of indexed Pull Requests from GitHub, committing per batch
+
+	Stops early when GitHub rejects a request (e.g. rate limited); running it again picks
+	up the Pull Requests that are still missing a SHA.
+	"""
+	import requests
+
+	pull_requests = frappe.get_all(
+		"Pull Request",
+		filters={
+			"merge_commit_sha": ("is", "not set"),
+			"repository": ("is", "set"),
+			"pull_request_number": ("is", "set"),
+		},
+		fields=["name", "repository", "pull_request_number"],
+	)
+	token = frappe.get_single("Release Settings").get_password(
+		"github_auth_token", raise_exception=False
+	)
+
+	with requests.Session() as session:
+		session.headers.update({"accept": "application/vnd.github.v3+json"})
+		if token:
+			session.headers["Authorization"] = f"token {token}"
+
+		for i, pr in enumerate(pull_requests, start=1):
+			res = session.get(
+				f"https://api.github.com/repos/{pr.repository}/pulls/{pr.pull_request_number}"
+			)
+			if res.status_code in (401, 403, 429):
+				frappe.logger("release").info(f"Stopped backfilling merge SHAs: {res.text}")
+				break
+
+			# open PRs carry the SHA of a test merge, which never ships
+			data = res.json() if res.ok else {}
+			if data.get("merged") and data.get("merge_commit_sha"):
+				frappe.db.set_value(
+					"Pull Request",
+					pr.name,
+					"merge_commit_sha",
+					data["merge_commit_sha"],
+					update_modified=False,
+				)
+
+			if i % batch_size == 0:
+				frappe.db.commit()
+
+	frappe.db.commit()
+
+
+def on_doctype_update():
+	frappe.db.add_index("Pull Request", ["repository", "pull_request_number"])
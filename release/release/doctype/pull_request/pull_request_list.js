@@ -0,0 +1,34 @@
+frappe.listview_settings["Pull Request"] = {
+	onload: function(listview) {
+		listview.page.add_actions_menu_item(__("Mark as Passed"), function() {
+			frappe.listview_settings["Pull Request"].bulk_review(listview, "Passed");
+		});
+		listview.page.add_actions_menu_item(__("Mark as Failed"), function() {
+			frappe.prompt(
+				{fieldname: "reason_for_failure", fieldtype: "Small Text", label: __("Reason for Failure"), reqd: 1},
+				values => {
+					frappe.listview_settings["Pull Request"].bulk_review(listview, "Failed", values.reason_for_failure);
+				},
+				__("Mark as Failed")
+			);
+		});
+	},
+	bulk_review: function(listview, status, reason_for_failure) {
+		let names = listview.get_checked_items(true);
+		frappe.call({
+			method: "release.release.doctype.pull_request.pull_request.bulk_review",
+			args: {names, status, reason_for_failure},
+			freeze: true,
+			freeze_message: __("Updating {0} Pull Requests", [names.length]),
+		}).then(r => {
+			let {updated, failed} = r.message;
+			let message = __("{0} Pull Requests marked as {1}", [updated.length, status]);
+			if (failed.length) {
+				message += "<ul>" + failed.map(f => `<li>${f.name}: ${f.error}</li>`).join("") + "</ul>";
+			}
+			frappe.msgprint(message);
+			listview.clear_checked_items();
+			listview.refresh();
+		});
+	}
+};
@@ -3,9 +3,185 @@
 # See license.txt
 from __future__ import unicode_literals
 
-# import frappe
 import unittest
+from unittest.mock import patch
+
+import frappe
+
+from release.release.doctype.pull_request.pull_request import (
+	bulk_review,
+	get_indexed_pull_requests,
+	get_shipped_pull_requests,
+	parse_pull_request_link,
+	update_release_status,
+)
+from release.release.search import QUEUE_KEY, queue_for_indexing, update_queued_index
+
+
+def make_release(name, docstatus=0, status="Draft", creation=None, repo="test-repo"):
+	# inserted directly, since validating a Release checks its branches on GitHub
+	frappe.get_doc(
+		{
+			"doctype": "Release",
+			"name": name,
+			"creation": creation,
+			"git_url": f"https://github.com/frappe/{repo}",
+			"stable_branch": "version-13",
+			"pre_release_branch": "version-13-pre-release",
+			"status": status,
+			"docstatus": docstatus,
+		}
+	).db_insert()
+	return name
+
+
+def make_pull_request(number, release, merge_commit_sha=None):
+	pr = frappe.get_doc(
+		{
+			"doctype": "Pull Request",
+			"pull_request_title": f"fix: Test Pull Request {number}",
+			"pull_request_link": f"https://github.com/frappe/test-repo/pull/{number}",
+			"pull_request_description": "Test description",
+			"merge_commit_sha": merge_commit_sha,
+			"release": release,
+		}
+	)
+	pr.flags.ignore_links = True
+	return pr.insert()
 
 
 class TestPullRequest(unittest.TestCase):
-	pass
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_parse_pull_request_link(self):
+		self.assertEqual(
+			parse_pull_request_link("https://github.com/frappe/frappe/pull/12345"),
+			("frappe", "frappe", "12345"),
+		)
+		self.assertEqual(
+			parse_pull_request_link("https://github.com/frappe/erpnext/pull/678/files"),
+			("frappe", "erpnext", "678"),
+		)
+		self.assertEqual(
+			parse_pull_request_link("https://github.com/frappe/frappe/issues/12345"),
+			(None, None, None),
+		)
+		self.assertEqual(parse_pull_request_link(None), (None, None, None))
+
+	def test_index_fields_set_on_insert(self):
+		pr = make_pull_request(101, "Test Release A")
+
+		self.assertEqual(pr.repository, "frappe/test-repo")
+		self.assertEqual(pr.pull_request_number, "101")
+
+	def test_get_shipped_pull_requests(self):
+		make_release("Test Release A", docstatus=1, status="Ready")
+		pr = make_pull_request(102, "Test Release A", merge_commit_sha="a" * 40)
+
+		shipped = get_shipped_pull_requests(
+			"frappe/test-repo", pull_numbers=[102, 103], exclude_release="Test Release B"
+		)
+		self.assertEqual(shipped.by_number, {"102": {"name": pr.name, "release": pr.release}})
+
+		shipped = get_shipped_pull_requests(
+			"frappe/test-repo", merge_commit_shas=["a" * 40], exclude_release="Test Release B"
+		)
+		self.assertIn("a" * 40, shipped.by_sha)
+
+		shipped = get_shipped_pull_requests(
+			"frappe/test-repo", pull_numbers=[102], exclude_release="Test Release A"
+		)
+		self.assertFalse(shipped.by_number)
+
+		shipped = get_shipped_pull_requests("frappe/other-repo", pull_numbers=[102])
+		self.assertFalse(shipped.by_number)
+
+	def test_unsubmitted_releases_not_shipped(self):
+		make_release("Test Release Draft")
+		make_release("Test Release Cancelled", docstatus=2)
+		draft_pr = make_pull_request(104, "Test Release Draft")
+		make_pull_request(105, "Test Release Cancelled")
+
+		shipped = get_shipped_pull_requests(
+			"frappe/test-repo", pull_numbers=[104, 105], exclude_release="Test Release B"
+		)
+		self.assertFalse(shipped.by_number)
+
+		indexed = get_indexed_pull_requests("frappe/test-repo", pull_numbers=[104])
+		self.assertEqual(indexed.by_number["104"]["name"], draft_pr.name)
+
+	def test_search_index_queue(self):
+		frappe.cache().delete_value(QUEUE_KEY)
+		frappe.flags.pull_request_indexing_queued = False
+
+		with patch("frappe.enqueue") as enqueue:
+			for name in ("PRT-1", "PRT-2", "PRT-3", "PRT-2"):
+				queue_for_indexing(name)
+		self.assertEqual(enqueue.call_count, 1)
+
+		with patch("release.release.search.update_index") as update_index:
+			update_queued_index(batch_size=2)
+
+		indexed = [name for call in update_index.call_args_list for name in call[0][0]]
+		self.assertEqual(update_index.call_count, 2)
+		self.assertEqual(sorted(indexed), ["PRT-1", "PRT-2", "PRT-3"])
+		self.assertFalse(frappe.cache().smembers(QUEUE_KEY))
+
+	def test_bulk_review(self):
+		release = make_release("Test Bulk Review", status="Pre Release Testing")
+		names = [make_pull_request(number, release).name for number in range(301, 304)]
+
+		submitted = make_pull_request(304, release)
+		submitted.status = "Passed"
+		submitted.submit()
+
+		with patch.object(frappe.db, "commit") as commit, patch(
+			"release.release.doctype.pull_request.pull_request.update_release_status",
+			wraps=update_release_status,
+		) as recompute:
+			result = bulk_review(
+				names + [submitted.name, "PRT-DOES-NOT-EXIST"], "Passed", batch_size=2
+			)
+
+		self.assertEqual(result["updated"], names)
+		self.assertEqual(
+			[failed["name"] for failed in result["failed"]],
+			[submitted.name, "PRT-DOES-NOT-EXIST"],
+		)
+		# one transaction and one status recompute per batch, not per Pull Request
+		self.assertEqual(commit.call_count, 3)
+		self.assertEqual(recompute.call_count, 2)
+
+		for name in names:
+			self.assertEqual(frappe.db.get_value("Pull Request", name, "docstatus"), 1)
+		self.assertEqual(frappe.db.get_value("Release", release, "status"), "Ready")
+
+	def test_bulk_review_failed(self):
+		release = make_release("Test Bulk Review Failed", status="Pre Release Testing")
+		pr = make_pull_request(311, release)
+
+		with patch.object(frappe.db, "commit"):
+			result = bulk_review([pr.name], "Failed", reason_for_failure="Breaks the form")
+
+		self.assertEqual(result["updated"], [pr.name])
+		pr.reload()
+		self.assertEqual((pr.status, pr.docstatus), ("Failed", 0))
+		self.assertEqual(
+			frappe.db.get_value("Release", release, "status"), "Pre Release Testing"
+		)
+		self.assertRaises(frappe.ValidationError, bulk_review, [pr.name], "Failed")
+
+	def test_update_release_status(self):
+		release = make_release("Test Release Status", status="Pre Release Testing")
+		submitted_release = make_release(
+			"Test Release Status Submitted", docstatus=1, status="Ready"
+		)
+		transitions = {"release": ("in", [release, submitted_release]), "status": "Ready"}
+
+		update_release_status(release)
+		update_release_status(release)
+		update_release_status(submitted_release)
+
+		self.assertEqual(frappe.db.get_value("Release", release, "status"), "Ready")
+		self.assertEqual(frappe.db.count("Release Status Transition", transitions), 1)
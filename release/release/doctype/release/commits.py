@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Compact, SHA keyed model of the commits in a GitHub compare response
+
+Only the first line of each message is kept along with the PR references parsed out
+of the full message, so large diffs don't hold every message body in memory and
+commits with identical messages stay distinct. The full message is kept only for the
+first commit referencing a PR, its merge commit, to be indexed for search.
+"""
+
+import hashlib
+import re
+from collections import namedtuple
+
+backport_identifiers = ("mergify/bp", "(bp #", "(backport #")
+backport_pattern = re.compile(r"\((?:bp|backport) #(\d+)\)")
+pull_request_pattern = re.compile(r"(?<!\(bp )#(\d+)")
+
+Commit = namedtuple(
+	"Commit", ["sha", "title", "pull_requests", "backport_of", "is_backport", "message"]
+)
+
+
+def parse_commit(sha, message, keep_message=False):
+	originals = backport_pattern.findall(message)
+
+	return Commit(
+		sha=sha,
+		title=message.split("\n", 1)[0],
+		pull_requests=tuple(pull_request_pattern.findall(message)),
+		backport_of=originals[0] if originals else None,
+		is_backport=any(txt in message for txt in backport_identifiers),
+		message=message if keep_message else None,
+	)
+
+
+def parse_commits(compare_commits):
+	"""Returns an ordered dict of SHA to Commit from the `commits` of a compare response"""
+	commits = {}
+	referenced = set()
+
+	for x in compare_commits:
+		message = x["commit"]["message"]
+		pull_requests = set(pull_request_pattern.findall(message))
+		commits[x["sha"]] = parse_commit(
+			x["sha"], message, keep_message=bool(pull_requests - referenced)
+		)
+		referenced |= pull_requests
+
+	return commits
+
+
+def get_commits_hash(shas):
+	return hashlib.sha1("\n".join(sorted(shas)).encode()).hexdigest()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Readiness checks run before a Release is submitted
+
+The GitHub checks are independent of each other, so they run concurrently in a thread
+pool. They only receive plain values since frappe's request locals (db connection, session)
+aren't available outside the main thread; database checks run on the main thread.
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+
+cache_expiry = 120  # seconds
+
+
+def get_report(release, refresh=False):
+	"""Returns the cached preflight report of `release`, running the checks if there's none
+
+	Returns:
+		dict: `passed` if all checks passed, with the result of each check under `checks`
+	"""
+	if not refresh:
+		report = get_cached_report(release)
+		if report:
+			return report
+
+	report = run_preflight_checks(release)
+	frappe.cache().set_value(get_cache_key(release), report, expires_in_sec=cache_expiry)
+
+	return report
+
+
+def get_cached_report(release):
+	return frappe.cache().get_value(get_cache_key(release))
+
+
+def get_cache_key(release):
+	return (
+		f"release_preflight::{release.name}::{release.tag_name}"
+		f"::{release.stable_branch}::{release.pre_release_branch}"
+	)
+
+
+def run_preflight_checks(release):
+	repo = f"{release.parsed.owner}/{release.parsed.name}"
+	headers = {
+		"Authorization": f"token {release.settings.get_password('github_auth_token')}",
+		"accept": "application/vnd.github.v3+json",
+	}
+	github_checks = [
+		(check_open_pull_requests_to_stable, (repo, release.stable_branch)),
+		(
+			check_pre_release_merged_into_stable,
+			(repo, release.stable_branch, release.pre_release_branch),
+		),
+		(
+			check_bump_commit,
+			(repo, release.parsed.name, release.pre_release_branch, release.tag_name),
+		),
+	]
+
+	with ThreadPoolExecutor(max_workers=len(github_checks)) as executor:
+		futures = [
+			executor.submit(safe_run, check, headers, *args) for check, args in github_checks
+		]
+		failed_manual_tests = check_failed_manual_tests(release.name)
+		checks = [future.result() for future in futures] + [failed_manual_tests]
+
+	return {
+		"passed": all(check["passed"] for check in checks),
+		"checks": checks,
+		"generated_on": str(datetime.datetime.now()),
+	}
+
+
+def safe_run(check, headers, *args):
+	try:
+		return check(headers, *args)
+	except Exception as e:
+		return result(check.__name__[len("check_"):], False, f"Check couldn't be run: {e}")
+
+
+def result(check, passed, message):
+	return {"check": check, "passed": passed, "message": message}
+
+
+def check_open_pull_requests_to_stable(headers, repo, stable_branch):
+	response = requests.get(
+		"https://api.github.com/search/issues",
+		params={"q": f"repo:{repo} is:pr is:open base:{stable_branch}", "per_page": 1},
+		headers=headers,
+	)
+	response.raise_for_status()
+	count = response.json()["total_count"]
+
+	return result(
+		"open_pull_requests_to_stable",
+		not count,
+		f"{count} open PRs to {stable_branch}" if count else f"No open PRs to {stable_branch}",
+	)
+
+
+def check_pre_release_merged_into_stable(headers, repo, stable_branch, pre_release_branch):
+	response = requests.get(
+		f"https://api.github.com/repos/{repo}/compare/{stable_branch}...{pre_release_branch}",
+		params={"per_page": 1},
+		headers=headers,
+	)
+	response.raise_for_status()
+	ahead_by = response.json()["ahead_by"]
+
+	return result(
+		"pre_release_merged_into_stable",
+		not ahead_by,
+		f"{pre_release_branch} is {ahead_by} commits ahead of {stable_branch}"
+		if ahead_by
+		else f"{pre_release_branch} is merged into {stable_branch}",
+	)
+
+
+def check_bump_commit(headers, repo, app_name, pre_release_branch, tag_name):
+	response = requests.get(
+		f"https://api.github.com/repos/{repo}/contents/{app_name}/__init__.py",
+		params={"ref": pre_release_branch},
+		headers={**headers, "accept": "application/vnd.github.v3.raw"},
+	)
+	response.raise_for_status()
+	bumped = f"__version__ = '{tag_name}'" in response.text
+
+	return result(
+		"bump_commit",
+		bumped,
+		f"{app_name}.__version__ is bumped to {tag_name} on {pre_release_branch}"
+		if bumped
+		else f"{app_name}.__version__ isn't bumped to {tag_name} on {pre_release_branch}",
+	)
+
+
+def check_failed_manual_tests(release_name):
+	count = frappe.db.count("Pull Request", {"release": release_name, "status": "Failed"})
+
+	return result(
+		"failed_manual_tests",
+		not count,
+		f"{count} Pull Requests failed manual testing" if count else "No failed Pull Requests",
+	)
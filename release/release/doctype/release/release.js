@@ -52,9 +52,50 @@ frappe.ui.form.on('Release', {
 			},
 			"Actions"
 		);
+		if (!frm.is_new()) {
+			frappe.xcall("release.release.analytics.get_monthly_summary", {release: frm.doc.name}).then(summary => {
+				if (!summary) return;
+				frm.dashboard.add_indicator(`${summary.releases} Releases this month`, "blue");
+				frm.dashboard.add_indicator(`${summary.pull_requests} Pull Requests this month`, "blue");
+				frm.dashboard.add_indicator(`${summary.failed_pull_requests} Failed this month`, summary.failed_pull_requests ? "red" : "green");
+			});
+		}
+		if (frm.doc.docstatus === 0 && !frm.is_new()) {
+			frm.call("get_preflight_report").then(r => {
+				if (!r.message) return;
+				let failed = r.message.checks.filter(check => !check.passed).length;
+				frm.dashboard.set_headline_alert(
+					failed
+						? `${failed} preflight checks failed on ${r.message.generated_on}`
+						: `Preflight checks passed on ${r.message.generated_on}`,
+					failed ? "red" : "green"
+				);
+			});
+		}
+		if (frm.doc.docstatus === 0) {
+			frm.add_custom_button(
+				"Run Preflight Checks",
+				() => {
+					frm.call("get_preflight_report", {refresh: 1}).then(r => {
+						frm.events.show_preflight_report(frm, r.message);
+					});
+				},
+				"Actions"
+			);
+		}
 		frappe.realtime.on("release", function (r) {
 			console.log(r);
 			frm.reload_doc();
 		});
+	},
+	show_preflight_report: function(frm, report) {
+		let rows = report.checks.map(check =>
+			`<li>${check.passed ? "✔" : "✘"} ${check.message}</li>`
+		).join("");
+		frappe.msgprint({
+			title: report.passed ? "Preflight Checks Passed" : "Preflight Checks Failed",
+			indicator: report.passed ? "green" : "red",
+			message: `<ul class="list-unstyled">${rows}</ul><p class="text-muted">Checked on ${report.generated_on}</p>`
+		});
 	}
 });
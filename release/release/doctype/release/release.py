@@ -14,11 +14,18 @@ from frappe.model.document import Document
 from giturlparse import parse
 from semantic_version import Version
 
+from release.release.analytics import log_status_transition
+from release.release.doctype.pull_request.pull_request import (
+	get_indexed_pull_requests,
+	get_shipped_pull_requests,
+)
+from release.release.doctype.release import preflight
+from release.release.doctype.release.commits import get_commits_hash, parse_commits
+
 remote = "origin"
 ignore_pr_type = ("chore", "bump")
 as_md = True  # changes titles, export formats
 skip_backports = False
-backport_identifiers = ("mergify/bp", "(bp #", "(backport #")
 
 # todo: make git_url, stable and pre release branch set only once -- maybe not...
 
@@ -44,14 +51,11 @@ class Release(Document):
 			self.set_release_info()
 
 	def on_update(self):
+		self.log_status_transition()
 		self.refresh_doc_on_desk()
 
 	def before_submit(self):
-		if not (
-			self.passed_manual_testing
-			and self.check_post_on_discuss
-			and self.check_ready_for_release
-		):
+		if not (self.check_post_on_discuss and self.check_ready_for_release):
 			frappe.throw("Can't submit without marking all checks!")
 
 		if not (self.release_name and self.tag_name):
@@ -60,10 +64,35 @@ class Release(Document):
 		if not (self.raised_pr_for_release and self.bump_commit_created):
 			frappe.throw("Run 'Raise PR for Release' before submitting this release")
 
+		report = preflight.get_report(self, refresh=True)
+		if not report["passed"]:
+			failed_checks = "".join(
+				f"<li>{check['message']}</li>" for check in report["checks"] if not check["passed"]
+			)
+			frappe.throw(f"Preflight checks failed:<ul>{failed_checks}</ul>")
+
 		self.status = "Ready"
 
 	def on_submit(self):
 		self.create_draft_release()
+		# always logged, even if a reviewed Pull Request already set the status to Ready,
+		# since analytics closes the time spent in each status on submission
+		log_status_transition(self.name, self.status)
+
+	def on_update_after_submit(self):
+		self.log_status_transition()
+
+	def log_status_transition(self):
+		if self.has_value_changed("status"):
+			log_status_transition(self.name, self.status)
+
+	@frappe.whitelist()
+	def get_preflight_report(self, refresh=False):
+		if frappe.utils.cint(refresh):
+			return preflight.get_report(self, refresh=True)
+
+		return preflight.get_cached_report(self)
+
 	@frappe.whitelist()
 	def raise_pr_for_release(self):
 		self.create_bump_commit_on_pre_release()
@@ -142,11 +171,6 @@ class Release(Document):
 		)
 
 	def create_draft_release(self):
-		if not self.pending_pull_requests_to_stable:
-			frappe.throw(
-				"There are open PRs to stable branch. Get them merged before submitting release!"
-			)
-
 		if not self.pre_release_merged_into_stable_branch:
 			frappe.throw(
 				"Check the field `Pre Release Merged Into Stable Branch` before you try"
@@ -286,6 +310,10 @@ class Release(Document):
 				pr.pull_request_number = number
 				pr.pull_request_title = data["title"]
 				pr.pull_request_link = data["link"]
+				pr.repository = self.repository
+				pr.merge_commit_sha = data.get("merge_commit_sha")
+				pr.merge_commit_message = data.get("merge_commit_message")
+				pr.backport_of = data.get("backport_of")
 				pr.release = self.name
 				pr.insert()
 			except frappe.DuplicateEntryError:
@@ -293,7 +321,10 @@ class Release(Document):
 			except Exception:
 				frappe.logger("release").info(frappe.get_traceback())
 
+		if getattr(self, "_commits_hash", None):
+			self.db_set("commits_hash", self._commits_hash, update_modified=False)
 		self.db_set("status", "Pre Release Testing")
+		log_status_transition(self.name, "Pre Release Testing")
 		self.refresh_doc_on_desk()
 
 	@property
@@ -331,22 +362,6 @@ class Release(Document):
 		if response.ok:
 			return response.json()
 
-	@property
-	def pending_pull_requests_to_stable(self):
-		return not requests.get(
-			f"https://api.github.com/repos/{self.parsed.owner}/{self.parsed.name}/pulls?base={self.stable_branch}",
-			headers={
-				"Authorization": f"token {self.settings.get_password('github_auth_token')}",
-				"accept": "application/vnd.github.v3+json",
-			},
-		).json()
-
-	@property
-	def passed_manual_testing(self):
-		return not frappe.get_all(
-			"Pull Request", filters={"release": self.name, "status": "Failed"}
-		)
-
 	@property
 	@functools.lru_cache()
 	def settings(self):
@@ -359,7 +374,7 @@ class Release(Document):
 	@property
 	def commits(self):
 		response = requests.get(
-			f"https://api.github.com/repos/frappe/frappe/compare/{self.stable_branch}...{self.pre_release_branch}",
+			f"https://api.github.com/repos/{self.parsed.owner}/{self.parsed.name}/compare/{self.stable_branch}...{self.pre_release_branch}",
 			headers={
 				"Authorization": f"token {self.settings.get_password('github_auth_token')}",
 				"accept": "application/vnd.github.v3+json",
@@ -368,29 +383,38 @@ class Release(Document):
 		if not response.ok:
 			response.raise_for_status()
 
-		updated_set = set([x["commit"]["message"] for x in response.json()["commits"]])
+		self._commits = parse_commits(response.json()["commits"])
+		commits_hash = get_commits_hash(self._commits)
 
-		if hasattr(self, "_commits") and updated_set != self._commits:
+		if commits_hash != getattr(self, "_commits_hash", self.commits_hash):
 			Release.titles.fget.cache_clear()
-		self._commits = updated_set
+		self._commits_hash = commits_hash
 
 		return self._commits
 
 	@property
 	def pull_requests(self):
 		pull_numbers = []
-		pr_merge_commits = []
+		self._pull_request_shas = {}
+		self._pull_request_commits = {}
+		self._backport_originals = {}
 
-		for commit in self.commits:
-			if "#" in commit and not (
-				skip_backports and any(txt in commit for txt in backport_identifiers)
-			):
-				pr_merge_commits.append(commit)
+		for commit in self.commits.values():
+			if not commit.pull_requests or (skip_backports and commit.is_backport):
+				continue
+
+			# the original of a backport is only used to link the backport to it
+			numbers = [x for x in commit.pull_requests if x != commit.backport_of]
+			pull_numbers = pull_numbers + numbers
 
-		for commit in pr_merge_commits:
-			pull_numbers = pull_numbers + re.findall(r"(?<!\(bp )#(\d+)", commit)
+			for number in numbers:
+				self._pull_request_shas.setdefault(number, commit.sha)
+				if commit.message:
+					self._pull_request_commits.setdefault(number, commit.message)
+				if commit.backport_of:
+					self._backport_originals.setdefault(number, commit.backport_of)
 
-		updated_set = set(pull_numbers)
+		updated_set = set(pull_numbers) - self.shipped_pull_request_numbers(pull_numbers)
 
 		if hasattr(self, "_pull_requests") and updated_set != self._pull_requests:
 			Release.titles.fget.cache_clear()
@@ -398,6 +422,36 @@ class Release(Document):
 
 		return self._pull_requests
 
+	@property
+	def repository(self):
+		return f"{self.parsed.owner}/{self.parsed.name}"
+
+	def shipped_pull_request_numbers(self, pull_numbers):
+		"""Drops PRs that were already shipped with a submitted Release, by PR number or
+		merge commit SHA, and links backports to their original Pull Request if one exists
+		"""
+		shipped = get_shipped_pull_requests(
+			self.repository,
+			pull_numbers=pull_numbers,
+			merge_commit_shas=self._pull_request_shas.values(),
+			exclude_release=self.name,
+		)
+		originals = get_indexed_pull_requests(
+			self.repository, pull_numbers=self._backport_originals.values()
+		)
+		self._backports_of = {}
+
+		for number, original in self._backport_originals.items():
+			if original in originals.by_number:
+				self._backports_of[number] = originals.by_number[original]["name"]
+
+		return {
+			number
+			for number in pull_numbers
+			if number in shipped.by_number
+			or self._pull_request_shas.get(number) in shipped.by_sha
+		}
+
 	@property
 	@functools.lru_cache()
 	def titles(self):
@@ -437,7 +491,13 @@ class Release(Document):
 
 			pr_link = f"https://github.com/{organization}/{repo_name}/pull/{pull_number}"
 
-			titles[pull_number] = {"title": title, "link": pr_link}
+			titles[pull_number] = {
+				"title": title,
+				"link": pr_link,
+				"merge_commit_sha": self._pull_request_shas.get(pull_number),
+				"merge_commit_message": self._pull_request_commits.get(pull_number),
+				"backport_of": self._backports_of.get(pull_number),
+			}
 
 		return titles
 
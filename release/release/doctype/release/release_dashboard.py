@@ -5,5 +5,8 @@
 def get_data():
 	return {
 		"fieldname": "release",
-		"transactions": [{"label": "GitHub", "items": ["Pull Request"]},],
+		"transactions": [
+			{"label": "GitHub", "items": ["Pull Request"]},
+			{"label": "Analytics", "items": ["Release Status Transition"]},
+		],
 	}
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and Contributors
+# See license.txt
+from __future__ import unicode_literals
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import frappe
+import requests
+
+from release.release.doctype.release import preflight
+
+
+def make_release():
+	return frappe._dict(
+		name="Test Preflight Release",
+		tag_name="13.0.1",
+		stable_branch="version-13",
+		pre_release_branch="version-13-pre-release",
+		parsed=frappe._dict(owner="frappe", name="frappe"),
+		settings=MagicMock(get_password=MagicMock(return_value="token")),
+	)
+
+
+def make_response(json=None, text="", status_code=200):
+	response = MagicMock(status_code=status_code, text=text)
+	response.json.return_value = json
+	if status_code >= 400:
+		response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error")
+	return response
+
+
+def mock_github(open_prs=0, ahead_by=0, version="13.0.1", compare_status=200):
+	def get(url, **kwargs):
+		if url.endswith("/search/issues"):
+			return make_response({"total_count": open_prs})
+		if "/compare/" in url:
+			return make_response({"ahead_by": ahead_by}, status_code=compare_status)
+		if url.endswith("/__init__.py"):
+			return make_response(text=f"__version__ = '{version}'\n")
+		raise AssertionError(f"Unexpected request to {url}")
+
+	return patch.object(preflight.requests, "get", side_effect=get)
+
+
+def mock_failed_manual_tests(count=0):
+	return patch.object(preflight.frappe.db, "count", return_value=count)
+
+
+class TestPreflight(unittest.TestCase):
+	def setUp(self):
+		self.release = make_release()
+		frappe.cache().delete_value(preflight.get_cache_key(self.release))
+
+	def test_all_checks_passed(self):
+		with mock_github() as get, mock_failed_manual_tests():
+			report = preflight.run_preflight_checks(self.release)
+
+		self.assertTrue(report["passed"])
+		self.assertEqual(
+			[check["check"] for check in report["checks"]],
+			[
+				"open_pull_requests_to_stable",
+				"pre_release_merged_into_stable",
+				"bump_commit",
+				"failed_manual_tests",
+			],
+		)
+		self.assertEqual(get.call_count, 3)
+
+	def test_failed_checks(self):
+		with mock_github(open_prs=2, version="13.0.0"), mock_failed_manual_tests(count=1):
+			report = preflight.run_preflight_checks(self.release)
+
+		self.assertFalse(report["passed"])
+		failed = {
+			check["check"]: check["message"] for check in report["checks"] if not check["passed"]
+		}
+		self.assertEqual(
+			failed,
+			{
+				"open_pull_requests_to_stable": "2 open PRs to version-13",
+				"bump_commit": (
+					"frappe.__version__ isn't bumped to 13.0.1 on version-13-pre-release"
+				),
+				"failed_manual_tests": "1 Pull Requests failed manual testing",
+			},
+		)
+
+	def test_check_errors(self):
+		with mock_github(compare_status=404), mock_failed_manual_tests():
+			report = preflight.run_preflight_checks(self.release)
+
+		merge_check = report["checks"][1]
+		self.assertFalse(report["passed"])
+		self.assertEqual(merge_check["check"], "pre_release_merged_into_stable")
+		self.assertFalse(merge_check["passed"])
+		self.assertEqual(merge_check["message"], "Check couldn't be run: 404 Error")
+
+	def test_report_cache(self):
+		with mock_github() as get, mock_failed_manual_tests():
+			self.assertIsNone(preflight.get_cached_report(self.release))
+
+			report = preflight.get_report(self.release)
+			self.assertEqual(preflight.get_report(self.release), report)
+			self.assertEqual(preflight.get_cached_report(self.release), report)
+			self.assertEqual(get.call_count, 3)
+
+			preflight.get_report(self.release, refresh=True)
+			self.assertEqual(get.call_count, 6)
+
+			self.release.tag_name = "13.0.2"
+			self.assertIsNone(preflight.get_cached_report(self.release))
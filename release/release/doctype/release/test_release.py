@@ -4,8 +4,76 @@
 from __future__ import unicode_literals
 
 # import frappe
+import tracemalloc
 import unittest
 
+from release.release.doctype.release.commits import get_commits_hash, parse_commits
+
+
+def make_compare_commits(
+	count, message="fix: Update dependencies (#100)\n\n{body}", start=0
+):
+	return [
+		{
+			"sha": f"{i:040x}",
+			"commit": {"message": message.format(i=i, body="Long description. " * 100)},
+		}
+		for i in range(start, start + count)
+	]
+
 
 class TestRelease(unittest.TestCase):
-	pass
+	def test_duplicate_messages(self):
+		commits = parse_commits(make_compare_commits(2))
+
+		self.assertEqual(len(commits), 2)
+		self.assertEqual(
+			[commit.title for commit in commits.values()],
+			["fix: Update dependencies (#100)"] * 2,
+		)
+		self.assertEqual(commits["0" * 40].pull_requests, ("100",))
+
+	def test_merge_commit_message(self):
+		commits = list(parse_commits(make_compare_commits(2)).values())
+
+		self.assertTrue(commits[0].message.startswith("fix: Update dependencies (#100)\n"))
+		self.assertIsNone(commits[1].message)
+
+	def test_backport_references(self):
+		commits = parse_commits(
+			make_compare_commits(1, message="fix: Update dependencies (backport #100) (#120)")
+		)
+		commit = commits["0" * 40]
+
+		self.assertEqual(commit.pull_requests, ("100", "120"))
+		self.assertEqual(commit.backport_of, "100")
+		self.assertTrue(commit.is_backport)
+
+	def test_commits_hash(self):
+		commits = parse_commits(make_compare_commits(10))
+
+		self.assertEqual(get_commits_hash(commits), get_commits_hash(reversed(list(commits))))
+		self.assertNotEqual(get_commits_hash(commits), get_commits_hash(list(commits)[1:]))
+
+	def test_memory_on_large_diffs(self):
+		def retained_size(build):
+			tracemalloc.start()
+			start, _ = tracemalloc.get_traced_memory()
+			# one in ten commits is a PR merge commit, whose message is kept
+			compare_commits = make_compare_commits(9000, message="fix: Change {i}\n\n{body}")
+			compare_commits += make_compare_commits(
+				1000, message="Merge pull request #{i}\n\n{body}", start=9000
+			)
+			result = build(compare_commits)
+			del compare_commits
+			current, _ = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+			self.assertTrue(result)
+			return current - start
+
+		message_set_size = retained_size(
+			lambda compare_commits: set(x["commit"]["message"] for x in compare_commits)
+		)
+		compact_size = retained_size(parse_commits)
+
+		self.assertLess(compact_size, message_set_size / 2)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and Contributors
+# See license.txt
+from __future__ import unicode_literals
+
+import datetime
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from release.release.analytics import add_status_durations, aggregate_release_analytics
+from release.release.doctype.pull_request.test_pull_request import (
+	make_pull_request,
+	make_release,
+)
+
+started_on = datetime.datetime(2020, 6, 10, 10, 0)
+
+
+def make_transitions(release, statuses):
+	for hours, status in statuses:
+		frappe.get_doc(
+			{
+				"doctype": "Release Status Transition",
+				"release": release,
+				"status": status,
+				"transition_on": started_on + datetime.timedelta(hours=hours),
+			}
+		).db_insert()
+
+
+def make_summary():
+	return frappe._dict(
+		hours_in_draft=0.0,
+		hours_processing_prs=0.0,
+		hours_pre_release_testing=0.0,
+		hours_ready=0.0,
+	)
+
+
+class TestReleaseAnalytics(unittest.TestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_add_status_durations(self):
+		make_transitions(
+			"Test Analytics Submitted",
+			[(0, "Draft"), (1, "Processing PRs"), (3, "Pre Release Testing"), (6, "Ready")],
+		)
+		make_transitions("Test Analytics Open", [(0, "Draft"), (2, "Ready")])
+		summaries = {
+			"Test Analytics Submitted": make_summary(),
+			"Test Analytics Open": make_summary(),
+		}
+
+		with patch(
+			"release.release.analytics.now_datetime",
+			return_value=started_on + datetime.timedelta(hours=12),
+		):
+			add_status_durations(summaries, {"Test Analytics Submitted"})
+
+		submitted = summaries["Test Analytics Submitted"]
+		self.assertEqual(submitted.hours_in_draft, 1)
+		self.assertEqual(submitted.hours_processing_prs, 2)
+		self.assertEqual(submitted.hours_pre_release_testing, 3)
+		# the transition logged on submission closes the Release
+		self.assertEqual(submitted.hours_ready, 0)
+
+		opened = summaries["Test Analytics Open"]
+		self.assertEqual(opened.hours_in_draft, 2)
+		self.assertEqual(opened.hours_ready, 10)
+
+	def test_aggregate_release_analytics(self):
+		make_release(
+			"Test Analytics Submitted",
+			docstatus=1,
+			status="Ready",
+			creation=started_on,
+			repo="test-analytics",
+		)
+		make_release("Test Analytics Open", creation=started_on, repo="test-analytics")
+		make_release(
+			"Test Analytics Cancelled", docstatus=2, creation=started_on, repo="test-analytics"
+		)
+		make_transitions("Test Analytics Submitted", [(0, "Draft"), (4, "Ready")])
+
+		make_pull_request(201, "Test Analytics Submitted")
+		failed = make_pull_request(202, "Test Analytics Submitted")
+		failed.db_set("status", "Failed")
+		make_pull_request(203, "Test Analytics Open")
+
+		aggregate_release_analytics([datetime.date(2020, 6, 1)])
+
+		analytics = frappe.get_all(
+			"Release Analytics",
+			filters={"repository": "frappe/test-analytics"},
+			fields=["month", "releases", "released", "pull_requests", "failed_pull_requests"],
+		)
+		self.assertEqual(len(analytics), 1)
+		self.assertEqual(str(analytics[0].month), "2020-06-01")
+		self.assertEqual(analytics[0].releases, 2)
+		self.assertEqual(analytics[0].released, 1)
+		self.assertEqual(analytics[0].pull_requests, 3)
+		self.assertEqual(analytics[0].failed_pull_requests, 1)
+
+		hours_in_draft = frappe.db.get_value(
+			"Release Analytics", {"repository": "frappe/test-analytics"}, "hours_in_draft"
+		)
+		self.assertEqual(hours_in_draft, 4)
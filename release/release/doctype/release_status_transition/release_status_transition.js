@@ -0,0 +1,8 @@
+// Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Release Status Transition', {
+	// refresh: function(frm) {
+
+	// }
+});
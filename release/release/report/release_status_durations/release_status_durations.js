@@ -0,0 +1,24 @@
+// Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Release Status Durations"] = {
+	filters: [
+		{
+			fieldname: "repository",
+			label: __("Repository"),
+			fieldtype: "Data",
+		},
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.add_months(frappe.datetime.get_today(), -12),
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+			default: frappe.datetime.get_today(),
+		},
+	],
+};
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+from frappe.utils import flt
+
+from release.release.analytics import status_fields
+from release.release.report.release_throughput.release_throughput import (
+	get_release_analytics,
+)
+
+
+def execute(filters=None):
+	return get_columns(), get_data(filters or {})
+
+
+def get_columns():
+	return [
+		{"fieldname": "repository", "label": "Repository", "fieldtype": "Data", "width": 180},
+		{"fieldname": "month", "label": "Month", "fieldtype": "Date", "width": 110},
+		{"fieldname": "releases", "label": "Releases", "fieldtype": "Int", "width": 90},
+	] + [
+		{
+			"fieldname": field,
+			"label": f"Avg. Hours in {status}",
+			"fieldtype": "Float",
+			"width": 180,
+		}
+		for status, field in status_fields.items()
+	]
+
+
+def get_data(filters):
+	rows = get_release_analytics(
+		filters, fields=["repository", "month", "releases"] + list(status_fields.values())
+	)
+
+	for row in rows:
+		for field in status_fields.values():
+			row[field] = flt(row[field] / row.releases, 2) if row.releases else 0
+
+	return rows
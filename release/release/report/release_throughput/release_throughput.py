@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import flt
+
+
+def execute(filters=None):
+	data = get_data(filters or {})
+	return get_columns(), data, None, get_chart(data)
+
+
+def get_columns():
+	return [
+		{"fieldname": "repository", "label": "Repository", "fieldtype": "Data", "width": 180},
+		{"fieldname": "month", "label": "Month", "fieldtype": "Date", "width": 110},
+		{"fieldname": "releases", "label": "Releases", "fieldtype": "Int", "width": 90},
+		{"fieldname": "released", "label": "Released", "fieldtype": "Int", "width": 90},
+		{"fieldname": "pull_requests", "label": "Pull Requests", "fieldtype": "Int", "width": 120},
+		{
+			"fieldname": "pull_requests_per_release",
+			"label": "PRs per Release",
+			"fieldtype": "Float",
+			"width": 130,
+		},
+		{
+			"fieldname": "failed_pull_requests",
+			"label": "Failed PRs",
+			"fieldtype": "Int",
+			"width": 100,
+		},
+		{"fieldname": "failure_rate", "label": "Failure Rate", "fieldtype": "Percent", "width": 110},
+	]
+
+
+def get_data(filters):
+	rows = get_release_analytics(filters)
+
+	for row in rows:
+		row.pull_requests_per_release = (
+			flt(row.pull_requests / row.releases, 2) if row.releases else 0
+		)
+		row.failure_rate = (
+			flt(row.failed_pull_requests * 100 / row.pull_requests, 2) if row.pull_requests else 0
+		)
+
+	return rows
+
+
+def get_release_analytics(filters, fields=None):
+	conditions = {}
+	if filters.get("repository"):
+		conditions["repository"] = filters["repository"]
+	if filters.get("from_date") and filters.get("to_date"):
+		conditions["month"] = ("between", [filters["from_date"], filters["to_date"]])
+
+	return frappe.get_all(
+		"Release Analytics",
+		filters=conditions,
+		fields=fields
+		or [
+			"repository",
+			"month",
+			"releases",
+			"released",
+			"pull_requests",
+			"failed_pull_requests",
+		],
+		order_by="month asc, repository asc",
+	)
+
+
+def get_chart(data):
+	releases_by_month = {}
+	for row in data:
+		releases_by_month[row.month] = releases_by_month.get(row.month, 0) + row.releases
+
+	return {
+		"data": {
+			"labels": [frappe.format(month, "Date") for month in releases_by_month],
+			"datasets": [{"name": "Releases", "values": list(releases_by_month.values())}],
+		},
+		"type": "bar",
+	}
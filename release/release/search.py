@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.search.full_text_search import FullTextSearch
+from whoosh.fields import ID, TEXT, Schema
+from whoosh.qparser import FieldsPlugin, MultifieldParser, OrGroup, WildcardPlugin
+from whoosh.query import Term
+from whoosh.writing import AsyncWriter
+
+INDEX_NAME = "pull_requests"
+QUEUE_KEY = "pull_request_search_queue"
+
+
+class PullRequestSearch(FullTextSearch):
+	"""Whoosh index over Pull Request titles, descriptions and merge commit messages"""
+
+	def get_schema(self):
+		return Schema(
+			name=ID(stored=True, unique=True),
+			title=TEXT(stored=True, field_boost=2.0),
+			description=TEXT,
+			commit_message=TEXT,
+			release=ID(stored=True),
+			repository=ID(stored=True),
+			link=ID(stored=True),
+		)
+
+	def get_fields_to_search(self):
+		return ["title", "description", "commit_message"]
+
+	def get_id(self):
+		return "name"
+
+	def get_items_to_index(self):
+		return [
+			self.get_document_to_index(pr)
+			for pr in frappe.get_all(
+				"Pull Request", filters={"docstatus": ("!=", 2)}, fields=self.get_fields()
+			)
+		]
+
+	def get_document_to_index(self, doc):
+		if isinstance(doc, str):
+			doc = frappe.db.get_value(
+				"Pull Request",
+				{"name": doc, "docstatus": ("!=", 2)},
+				self.get_fields(),
+				as_dict=True,
+			)
+			if not doc:
+				return
+
+		return frappe._dict(
+			name=doc.name,
+			title=doc.pull_request_title or "",
+			description=doc.pull_request_description or "",
+			commit_message=doc.merge_commit_message or "",
+			release=doc.release or "",
+			repository=doc.repository or "",
+			link=doc.pull_request_link or "",
+		)
+
+	def get_fields(self):
+		return [
+			"name",
+			"pull_request_title",
+			"pull_request_description",
+			"merge_commit_message",
+			"release",
+			"repository",
+			"pull_request_link",
+		]
+
+	def search_page(self, text, page=1, page_length=20, repository=None):
+		"""Returns one page of Pull Requests matching `text`, ranked by BM25F score
+
+		Returns:
+			dict: `total` number of hits and `results` on the requested page
+		"""
+		ix = self.get_index()
+
+		with ix.searcher() as searcher:
+			parser = MultifieldParser(self.get_fields_to_search(), ix.schema, group=OrGroup)
+			parser.remove_plugin_class(FieldsPlugin)
+			parser.remove_plugin_class(WildcardPlugin)
+			query = parser.parse(text)
+			scope = Term("repository", repository) if repository else None
+
+			results = searcher.search_page(query, page, pagelen=page_length, filter=scope)
+
+			return {
+				"total": results.total,
+				"results": [
+					{
+						"name": hit["name"],
+						"title": hit["title"],
+						"release": hit["release"],
+						"repository": hit["repository"],
+						"link": hit["link"],
+						"score": hit.score,
+					}
+					for hit in results
+				],
+			}
+
+
+def build_index():
+	PullRequestSearch(INDEX_NAME).build()
+
+
+def queue_for_indexing(name):
+	"""Queues a Pull Request to be re-indexed, with one job per request draining the queue
+
+	Saving hundreds of Pull Requests in a request (processing a Release, bulk reviews)
+	then costs a single index writer instead of a job, an index lock and an optimize each.
+	Names queued after the job has run are picked up by the scheduler.
+	"""
+	frappe.cache().sadd(QUEUE_KEY, name)
+
+	if not frappe.flags.pull_request_indexing_queued:
+		frappe.flags.pull_request_indexing_queued = True
+		frappe.enqueue(
+			"release.release.search.update_queued_index",
+			queue="short",
+			enqueue_after_commit=True,
+		)
+
+
+def update_queued_index(batch_size=500):
+	cache = frappe.cache()
+
+	while True:
+		names = []
+		while len(names) < batch_size:
+			name = cache.spop(QUEUE_KEY)
+			if not name:
+				break
+			names.append(frappe.safe_decode(name))
+
+		if not names:
+			break
+
+		update_index(names)
+
+
+def update_index(names):
+	"""Re-indexes `names` with one writer, dropping the ones that were deleted or cancelled"""
+	search = PullRequestSearch(INDEX_NAME)
+	writer = AsyncWriter(search.get_index())
+
+	for name in names:
+		writer.delete_by_term(search.get_id(), name)
+		document = search.get_document_to_index(name)
+		if document:
+			writer.add_document(**document)
+
+	writer.commit()
+
+
+def search(text, page=1, page_length=20, repository=None):
+	return PullRequestSearch(INDEX_NAME).search_page(
+		text, page=page, page_length=page_length, repository=repository
+	)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020, Frappe Technologies Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Benchmark of Pull Request search over a synthetic index
+
+Run on a site with:
+
+	bench --site <site> execute release.release.search_benchmark.run
+	bench --site <site> execute release.release.search_benchmark.run --kwargs "{'count': 10000}"
+
+Builds a separate index, so the site's Pull Request index is left untouched.
+"""
+
+import os
+import random
+import shutil
+import statistics
+import time
+
+from whoosh.index import create_in
+
+from release.release.search import PullRequestSearch
+
+INDEX_NAME = "pull_requests_benchmark"
+TARGET_MS = 100
+
+words = (
+	"fix feat refactor perf chore test docs report print format list view form grid "
+	"dashboard permission role user email notification workflow payment invoice "
+	"ledger stock item warehouse serial batch website portal web page blog search "
+	"filter sort group export import upload attachment file image translation "
+	"timezone date datetime currency rounding precision validation error message "
+	"query index cache redis queue scheduler job socketio realtime api rest token"
+).split()
+
+queries = [
+	"invoice rounding",
+	"permission",
+	"socketio realtime error",
+	"stock ledger precision",
+	"export filter group",
+	"cache redis queue scheduler",
+]
+
+
+def run(count=100000, iterations=20, page_length=20, keep_index=False):
+	search = PullRequestSearch(INDEX_NAME)
+	rng = random.Random(count)
+
+	build_started = time.perf_counter()
+	build_index(search, count, rng)
+	build_time = time.perf_counter() - build_started
+
+	results = {}
+	try:
+		for query in queries:
+			search.search_page(query, page_length=page_length)
+			timings = []
+			for i in range(iterations):
+				started = time.perf_counter()
+				page = search.search_page(query, page=i % 5 + 1, page_length=page_length)
+				timings.append((time.perf_counter() - started) * 1000)
+
+			results[query] = {
+				"hits": page["total"],
+				"median_ms": round(statistics.median(timings), 2),
+				"max_ms": round(max(timings), 2),
+			}
+	finally:
+		if not keep_index:
+			shutil.rmtree(search.index_path, ignore_errors=True)
+
+	print(f"Indexed {count} Pull Requests in {build_time:.1f}s")
+	for query, result in results.items():
+		print(
+			f"{query!r}: {result['hits']} hits, median {result['median_ms']}ms,"
+			f" max {result['max_ms']}ms"
+		)
+
+	slowest = max(result["max_ms"] for result in results.values())
+	verdict = "within" if slowest < TARGET_MS else "over"
+	print(f"Slowest query: {slowest}ms, {verdict} the {TARGET_MS}ms target")
+
+	return {"count": count, "build_seconds": round(build_time, 1), "queries": results}
+
+
+def build_index(search, count, rng):
+	shutil.rmtree(search.index_path, ignore_errors=True)
+	os.makedirs(search.index_path)
+
+	writer = create_in(search.index_path, search.get_schema()).writer(limitmb=256)
+
+	for i in range(count):
+		title = " ".join(rng.choices(words, k=8))
+		writer.add_document(
+			name=f"PRT-BENCH-{i:06d}",
+			title=title,
+			description=" ".join(rng.choices(words, k=120)),
+			commit_message=f"{title} (#{i})\n\n" + " ".join(rng.choices(words, k=40)),
+			release=f"Release {i // 300}",
+			repository=f"frappe/app-{i % 10}",
+			link=f"https://github.com/frappe/app-{i % 10}/pull/{i}",
+		)
+
+	writer.commit()